@@ -1,25 +1,116 @@
 
 import os
-from datetime import datetime
-from flask import Flask, request, jsonify
+import sqlite3
+import time
+from functools import lru_cache, wraps
+from math import ceil
+import msgspec
+import click
+import orjson
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from flask import Flask, request, jsonify, abort, g, make_response
+from flask.json.provider import JSONProvider
+from flask_caching import Cache
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import DateTime, event, func, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.orm import load_only, object_session, selectinload
 from flask_migrate import Migrate
 from flask_cors import CORS
 from dotenv import load_dotenv
+from werkzeug.exceptions import HTTPException
+from redis import Redis
+from redis.exceptions import RedisError
+from rq import Queue
+from rq.exceptions import NoSuchJobError
+from rq.job import Job
 
 load_dotenv()
 
+
+class OrjsonProvider(JSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_UTC_Z).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=orjson.OPT_UTC_Z), mimetype='application/json')
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'better-software-secret-key-2025')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///better_software.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'query_cache_size': 1200,
+    'pool_pre_ping': True,
+    'pool_recycle': 1800
+}
+database_url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+if database_url.get_backend_name() == 'sqlite':
+    app.config['SQLALCHEMY_ENGINE_OPTIONS']['connect_args'] = {'check_same_thread': False}
+if database_url.get_backend_name() != 'sqlite' or database_url.database not in (None, '', ':memory:'):
+    # In-memory SQLite gets a StaticPool, which takes no sizing options.
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].update(pool_size=20, max_overflow=40)
+app.config['CACHE_TYPE'] = os.getenv('CACHE_TYPE', 'RedisCache')
+app.config['CACHE_REDIS_URL'] = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 
 db = SQLAlchemy(app)
-migrate = Migrate(app, db)
+migrate = Migrate(app, db, directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations'))
+cache = Cache(app)
+redis_client = Redis.from_url(app.config['CACHE_REDIS_URL'])
+queue = Queue(connection=redis_client)
 CORS(app, origins=['http://localhost:3000'])
 
 
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragma(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.close()
+
+
+class utcnow(FunctionElement):
+    # DateTime columns are naive, so the server must stamp them in UTC.
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def compile_utcnow(element, compiler, **kw):
+    return 'CURRENT_TIMESTAMP'
+
+
+@compiles(utcnow, 'postgresql')
+def compile_utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, 'mysql')
+@compiles(utcnow, 'mariadb')
+def compile_utcnow_mysql(element, compiler, **kw):
+    # Parenthesised so MySQL also accepts it as a column DEFAULT.
+    return '(UTC_TIMESTAMP())'
+
+
+@lru_cache(maxsize=None)
+def compile_serializer(fields):
+    body = ', '.join(f"'{field}': self.{field}" for field in fields)
+    namespace = {}
+    exec(f'def to_dict(self):\n    return {{{body}}}\n', namespace)
+    return namespace['to_dict']
+
+
 class Task(db.Model):
     __tablename__ = 'tasks'
     id = db.Column(db.Integer, primary_key=True)
@@ -27,20 +118,17 @@ class Task(db.Model):
     description = db.Column(db.Text, nullable=True)
     status = db.Column(db.String(50), default='pending')
     priority = db.Column(db.String(20), default='medium')
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    comments = db.relationship('Comment', backref='task', lazy=True, cascade='all, delete-orphan')
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'status': self.status,
-            'priority': self.priority,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'comments_count': len(self.comments) if self.comments else 0
-        }
+    created_at = db.Column(db.DateTime, server_default=utcnow())
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=utcnow())
+    comments = db.relationship('Comment', back_populates='task', lazy='raise', cascade='all, delete-orphan')
+    __table_args__ = (db.Index('ix_tasks_created_at', created_at.desc(), id.desc()),)
+    __mapper_args__ = {'eager_defaults': True}
+    FIELDS = ('id', 'title', 'description', 'status', 'priority', 'created_at', 'updated_at')
+    serialize = compile_serializer(FIELDS)
+    def to_dict(self, comments_count):
+        data = self.serialize()
+        data['comments_count'] = comments_count
+        return data
     def __repr__(self):
         return f'<Task {self.id}: {self.title}>'
 
@@ -50,208 +138,483 @@ class Comment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.Text, nullable=False)
     task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'content': self.content,
-            'task_id': self.task_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    created_at = db.Column(db.DateTime, server_default=utcnow())
+    updated_at = db.Column(db.DateTime, server_default=utcnow(), onupdate=utcnow())
+    task = db.relationship('Task', back_populates='comments')
+    __table_args__ = (db.Index('ix_comments_task_created', task_id, created_at.desc(), id.desc()),)
+    __mapper_args__ = {'eager_defaults': True}
+    to_dict = compile_serializer(('id', 'content', 'task_id', 'created_at', 'updated_at'))
     def __repr__(self):
         return f'<Comment {self.id}: {self.content[:50]}...>'
 
 
+class TaskIn(msgspec.Struct):
+    title: str = ''
+    description: str = ''
+    status: str = 'pending'
+    priority: str = 'medium'
+
+
+class TaskUpdate(msgspec.Struct):
+    title: str | msgspec.UnsetType = msgspec.UNSET
+    description: str | msgspec.UnsetType = msgspec.UNSET
+    status: str | msgspec.UnsetType = msgspec.UNSET
+    priority: str | msgspec.UnsetType = msgspec.UNSET
+
+
+class CommentIn(msgspec.Struct):
+    content: str = ''
+
+
+
+def task_exists(task_id):
+    return db.session.query(db.exists().where(Task.id == task_id)).scalar()
+
+
+def count_comments(task_id):
+    return db.session.query(func.count(Comment.id)).filter(Comment.task_id == task_id).scalar()
+
+
+task_comments_count = select(func.count(Comment.id)).where(Comment.task_id == Task.id) \
+    .scalar_subquery().label('comments_count')
+
+
+def _mark_stale(session, *names):
+    session.info.setdefault('stale_versions', set()).update(names)
+
+
+@event.listens_for(Task, 'after_insert')
+@event.listens_for(Task, 'after_update')
+@event.listens_for(Task, 'after_delete')
+def task_changed(mapper, connection, target):
+    _mark_stale(object_session(target), 'tasks', f'task:{target.id}')
+
+
+@event.listens_for(Comment, 'after_insert')
+@event.listens_for(Comment, 'after_update')
+@event.listens_for(Comment, 'after_delete')
+def comment_changed(mapper, connection, target):
+    _mark_stale(object_session(target), 'tasks', f'task:{target.task_id}', f'comment:{target.id}')
+
+
+def _track_count(target, name, delta):
+    deltas = object_session(target).info.setdefault('count_deltas', {})
+    deltas[name] = deltas.get(name, 0) + delta
+
+
+@event.listens_for(Task, 'after_insert')
+def task_inserted(mapper, connection, target):
+    _track_count(target, 'tasks', 1)
+
+
+@event.listens_for(Task, 'after_delete')
+def task_deleted(mapper, connection, target):
+    _track_count(target, 'tasks', -1)
+
+
+@event.listens_for(Comment, 'after_insert')
+def comment_inserted(mapper, connection, target):
+    _track_count(target, f'comments:{target.task_id}', 1)
+
+
+@event.listens_for(Comment, 'after_delete')
+def comment_deleted(mapper, connection, target):
+    _track_count(target, f'comments:{target.task_id}', -1)
+
+
+# Reseeding a version invalidates every ETag and cached payload for that
+# resource, so versions outlive the default cache timeout by far. They still
+# expire, to heal a bump lost while Redis was unreachable and to drop the
+# versions of deleted rows.
+VERSION_TIMEOUT = 24 * 60 * 60
+
+
+@event.listens_for(db.session, 'after_commit')
+def bump_versions(session):
+    stale_versions = session.info.pop('stale_versions', ())
+    count_deltas = session.info.pop('count_deltas', {})
+    try:
+        for name in stale_versions:
+            cache.add(f'version:{name}', time.time_ns(), timeout=VERSION_TIMEOUT)
+            cache.cache.inc(f'version:{name}')
+        for name, delta in count_deltas.items():
+            # inc() recreates an expired counter from zero without a timeout, so
+            # a result equal to the delta means there was nothing to adjust.
+            if delta and cache.cache.inc(f'count:{name}', delta) == delta:
+                cache.delete(f'count:{name}')
+    except RedisError:
+        # The write is already committed; failing the request here would only
+        # invite a retry that writes it twice.
+        app.logger.exception('Could not invalidate cached resources after commit')
+
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_versions(session):
+    session.info.pop('stale_versions', None)
+    session.info.pop('count_deltas', None)
+
+
+def cached_count(name, query):
+    # Counters are seeded lazily and expire, so a write racing the seed can
+    # only leave them off for one timeout.
+    try:
+        total = cache.get(f'count:{name}')
+        if total is None:
+            total = query.count()
+            cache.add(f'count:{name}', total, timeout=300)
+    except RedisError:
+        app.logger.exception('Could not read cached count %s', name)
+        total = query.count()
+    return total
+
+
+def resource_versions(resources):
+    # Versions start from a timestamp rather than zero so that an ETag issued
+    # before the cache was flushed can never match a restarted counter.
+    # Without Redis there are no versions; callers then serve uncached.
+    if 'resource_versions' not in g:
+        names = [f'version:{resource.format(**request.view_args)}' for resource in resources]
+        try:
+            versions = cache.get_many(*names)
+            for name, version in zip(names, versions):
+                if version is None:
+                    cache.add(name, time.time_ns(), timeout=VERSION_TIMEOUT)
+            if None in versions:
+                versions = cache.get_many(*names)
+            g.resource_versions = '.'.join(str(version) for version in versions)
+        except RedisError:
+            app.logger.exception('Could not read resource versions, serving uncached')
+            g.resource_versions = None
+    return g.resource_versions
+
+
+def versioned_key(*resources):
+    def key_prefix():
+        return f'view/{request.path}/{resource_versions(resources)}/'
+    return key_prefix
+
+
+def versions_unavailable(*resources):
+    def unless():
+        return resource_versions(resources) is None
+    return unless
+
+
+def task_dict(task_id):
+    task = db.session.get(Task, task_id)
+    return task.to_dict(count_comments(task_id)) if task else None
+
+
+def comment_dict(comment_id):
+    comment = db.session.get(Comment, comment_id)
+    return comment.to_dict() if comment else None
+
+
+@lru_cache(maxsize=4096)
+def cached_task_dict(task_id, version):
+    return task_dict(task_id)
+
+
+@lru_cache(maxsize=4096)
+def cached_comment_dict(comment_id, version):
+    return comment_dict(comment_id)
+
+
+def conditional(*resources):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**view_args):
+            versions = resource_versions(resources)
+            if versions is None:
+                return view(**view_args)
+            etag = f'{request.path}-{versions}'
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+                response.set_etag(etag, weak=True)
+                return response
+            response = make_response(view(**view_args))
+            if response.status_code == 200:
+                response.set_etag(etag, weak=True)
+            return response
+        return wrapper
+    return decorator
+
+
+def cacheable(rv):
+    status = rv[1] if isinstance(rv, tuple) else rv.status_code
+    return status == 200
+
+
+def wants_async():
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+
+def enqueue_write(func, resource, fields):
+    job = queue.enqueue(func, fields, result_ttl=300, meta={'resource': resource})
+    response = jsonify({
+        'message': f'{resource.capitalize()} accepted',
+        'job_id': job.id
+    })
+    response.headers['Location'] = f'/api/jobs/{job.id}'
+    response.headers['Preference-Applied'] = 'respond-async'
+    return response, 202
+
+
+def persist_task(fields):
+    with app.app_context():
+        task = Task(**fields)
+        db.session.add(task)
+        db.session.commit()
+        return task.to_dict(comments_count=0)
+
+
+def persist_comment(fields):
+    with app.app_context():
+        comment = Comment(**fields)
+        db.session.add(comment)
+        db.session.commit()
+        return comment.to_dict()
+
+
+@app.after_request
+def commit_session(response):
+    if request.method in ('POST', 'PUT', 'DELETE') and response.status_code < 400:
+        try:
+            db.session.commit()
+        except Exception as e:
+            # close() rather than rollback(): a failing after_commit hook leaves
+            # the session committed, and rollback() would raise again.
+            db.session.close()
+            response = jsonify({'error': 'Failed to save changes', 'message': str(e)})
+            response.status_code = 500
+    return response
+
+
+@app.after_request
+def add_etag(response):
+    if request.method == 'GET' and response.status_code == 200:
+        if 'ETag' not in response.headers:
+            response.add_etag(weak=True)
+        response.make_conditional(request)
+    return response
+
 
 @app.route('/api/tasks', methods=['GET'])
+@conditional('tasks')
+@cache.cached(timeout=60, query_string=True, key_prefix=versioned_key('tasks'), unless=versions_unavailable('tasks'), response_filter=cacheable)
 def get_tasks():
-    try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-        tasks_query = Task.query.order_by(Task.created_at.desc())
-        tasks_paginated = tasks_query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
-        return jsonify({
-            'tasks': [task.to_dict() for task in tasks_paginated.items],
-            'total': tasks_paginated.total,
-            'pages': tasks_paginated.pages,
-            'current_page': page,
-            'has_next': tasks_paginated.has_next,
-            'has_prev': tasks_paginated.has_prev
-        }), 200
-    except Exception as e:
-        return jsonify({'error': 'Failed to retrieve tasks', 'message': str(e)}), 500
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+    requested = {field.strip() for field in request.args.get('fields', '').split(',')}
+    fields = tuple(field for field in Task.FIELDS if field == 'id' or field in requested) \
+        if 'fields' in request.args else Task.FIELDS
+    tasks_query = db.session.query(Task, task_comments_count) \
+        .options(load_only(*(getattr(Task, field) for field in fields))) \
+        .order_by(Task.created_at.desc(), Task.id.desc())
+    tasks_paginated = tasks_query.paginate(
+        page=page, per_page=per_page, count=False, error_out=False
+    )
+    total = cached_count('tasks', Task.query)
+    pages = ceil(total / tasks_paginated.per_page)
+    serialize = compile_serializer(fields)
+    return jsonify({
+        'tasks': [
+            {**serialize(task), 'comments_count': comments_count}
+            for task, comments_count in tasks_paginated.items
+        ],
+        'total': total,
+        'pages': pages,
+        'current_page': page,
+        'has_next': tasks_paginated.page < pages,
+        'has_prev': tasks_paginated.has_prev
+    }), 200
 
 
 @app.route('/api/tasks', methods=['POST'])
 def create_task():
-    try:
-        data = request.get_json()
-        if not data or not data.get('title'):
-            return jsonify({'error': 'Task title is required'}), 400
-        if not data['title'].strip():
-            return jsonify({'error': 'Task title cannot be empty'}), 400
-        task = Task(
-            title=data['title'].strip(),
-            description=data.get('description', '').strip(),
-            status=data.get('status', 'pending'),
-            priority=data.get('priority', 'medium')
-        )
-        db.session.add(task)
-        db.session.commit()
-        return jsonify({
-            'message': 'Task created successfully',
-            'task': task.to_dict()
-        }), 201
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': 'Failed to create task', 'message': str(e)}), 500
+    data = msgspec.json.decode(request.get_data(), type=TaskIn)
+    if not data.title:
+        return jsonify({'error': 'Task title is required'}), 400
+    if not data.title.strip():
+        return jsonify({'error': 'Task title cannot be empty'}), 400
+    fields = {
+        'title': data.title.strip(),
+        'description': data.description.strip(),
+        'status': data.status,
+        'priority': data.priority
+    }
+    if wants_async():
+        return enqueue_write('backend.persist_task', 'task', fields)
+    task = Task(**fields)
+    db.session.add(task)
+    db.session.flush()
+    return jsonify({
+        'message': 'Task created successfully',
+        'task': task.to_dict(comments_count=0)
+    }), 201
 
 
 @app.route('/api/tasks/<int:task_id>', methods=['GET'])
+@conditional('task:{task_id}')
+@cache.cached(timeout=60, key_prefix=versioned_key('task:{task_id}'), unless=versions_unavailable('task:{task_id}'), response_filter=cacheable)
 def get_task(task_id):
-    try:
-        task = Task.query.get_or_404(task_id)
-        return jsonify({'task': task.to_dict()}), 200
-    except Exception as e:
-        return jsonify({'error': 'Task not found', 'message': str(e)}), 404
+    version = resource_versions(('task:{task_id}',))
+    task = cached_task_dict(task_id, version) if version else task_dict(task_id)
+    if task is None:
+        abort(404)
+    return jsonify({'task': task}), 200
 
 
 @app.route('/api/tasks/<int:task_id>', methods=['PUT'])
 def update_task(task_id):
-    try:
-        task = Task.query.get_or_404(task_id)
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-        if 'title' in data:
-            if not data['title'].strip():
-                return jsonify({'error': 'Task title cannot be empty'}), 400
-            task.title = data['title'].strip()
-        if 'description' in data:
-            task.description = data['description'].strip()
-        if 'status' in data:
-            task.status = data['status']
-        if 'priority' in data:
-            task.priority = data['priority']
-        task.updated_at = datetime.utcnow()
-        db.session.commit()
-        return jsonify({
-            'message': 'Task updated successfully',
-            'task': task.to_dict()
-        }), 200
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': 'Failed to update task', 'message': str(e)}), 500
+    data = msgspec.to_builtins(msgspec.json.decode(request.get_data(), type=TaskUpdate))
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    if 'title' in data:
+        data['title'] = data['title'].strip()
+        if not data['title']:
+            return jsonify({'error': 'Task title cannot be empty'}), 400
+    if 'description' in data:
+        data['description'] = data['description'].strip()
+    columns = (
+        *(getattr(Task, field) for field in Task.FIELDS),
+        # SQLite leaves RETURNING columns unqualified, so a correlated
+        # tasks.id would resolve to comments.id inside the subquery.
+        select(func.count(Comment.id)).where(Comment.task_id == task_id)
+        .scalar_subquery().label('comments_count')
+    )
+    statement = update(Task).where(Task.id == task_id).values(**data)
+    options = {'synchronize_session': False}
+    if db.engine.dialect.update_returning:
+        row = db.session.execute(statement.returning(*columns), execution_options=options).one_or_none()
+    else:
+        # MySQL and MariaDB have no UPDATE ... RETURNING, so read the row back.
+        db.session.execute(statement, execution_options=options)
+        row = db.session.execute(select(*columns).where(Task.id == task_id)).one_or_none()
+    if row is None:
+        abort(404)
+    _mark_stale(db.session, 'tasks', f'task:{task_id}')
+    return jsonify({
+        'message': 'Task updated successfully',
+        'task': dict(row._mapping)
+    }), 200
 
 
 @app.route('/api/tasks/<int:task_id>', methods=['DELETE'])
 def delete_task(task_id):
-    try:
-        task = Task.query.get_or_404(task_id)
-        db.session.delete(task)
-        db.session.commit()
-        return jsonify({'message': 'Task deleted successfully'}), 200
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': 'Failed to delete task', 'message': str(e)}), 500
+    task = Task.query.options(selectinload(Task.comments)).get_or_404(task_id)
+    db.session.delete(task)
+    db.session.flush()
+    return jsonify({'message': 'Task deleted successfully'}), 200
 
 
 
 @app.route('/api/tasks/<int:task_id>/comments', methods=['GET'])
+@conditional('task:{task_id}')
+@cache.cached(timeout=60, query_string=True, key_prefix=versioned_key('task:{task_id}'), unless=versions_unavailable('task:{task_id}'), response_filter=cacheable)
 def get_comments(task_id):
-    try:
-        task = Task.query.get_or_404(task_id)
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-        comments_query = Comment.query.filter_by(task_id=task_id).order_by(Comment.created_at.desc())
-        comments_paginated = comments_query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
-        return jsonify({
-            'comments': [comment.to_dict() for comment in comments_paginated.items],
-            'total': comments_paginated.total,
-            'pages': comments_paginated.pages,
-            'current_page': page,
-            'per_page': per_page,
-            'has_next': comments_paginated.has_next,
-            'has_prev': comments_paginated.has_prev
-        }), 200
-    except Exception as e:
-        return jsonify({'error': 'Failed to retrieve comments', 'message': str(e)}), 500
+    if not task_exists(task_id):
+        abort(404)
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 10, type=int)
+    comments_query = Comment.query.filter_by(task_id=task_id).order_by(Comment.created_at.desc(), Comment.id.desc())
+    comments_paginated = comments_query.paginate(
+        page=page, per_page=per_page, count=False, error_out=False
+    )
+    total = cached_count(f'comments:{task_id}', Comment.query.filter_by(task_id=task_id))
+    pages = ceil(total / comments_paginated.per_page)
+    return jsonify({
+        'comments': [comment.to_dict() for comment in comments_paginated.items],
+        'total': total,
+        'pages': pages,
+        'current_page': page,
+        'per_page': per_page,
+        'has_next': comments_paginated.page < pages,
+        'has_prev': comments_paginated.has_prev
+    }), 200
 
 
 @app.route('/api/tasks/<int:task_id>/comments', methods=['POST'])
 def create_comment(task_id):
-    try:
-        task = Task.query.get_or_404(task_id)
-        data = request.get_json()
-        if not data or not data.get('content'):
-            return jsonify({'error': 'Comment content is required'}), 400
-        if not data['content'].strip():
-            return jsonify({'error': 'Comment content cannot be empty'}), 400
-        comment = Comment(
-            content=data['content'].strip(),
-            task_id=task_id
-        )
-        db.session.add(comment)
-        db.session.commit()
-        return jsonify({
-            'message': 'Comment created successfully',
-            'comment': comment.to_dict()
-        }), 201
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': 'Failed to create comment', 'message': str(e)}), 500
+    if not task_exists(task_id):
+        abort(404)
+    data = msgspec.json.decode(request.get_data(), type=CommentIn)
+    if not data.content:
+        return jsonify({'error': 'Comment content is required'}), 400
+    if not data.content.strip():
+        return jsonify({'error': 'Comment content cannot be empty'}), 400
+    fields = {
+        'content': data.content.strip(),
+        'task_id': task_id
+    }
+    if wants_async():
+        return enqueue_write('backend.persist_comment', 'comment', fields)
+    comment = Comment(**fields)
+    db.session.add(comment)
+    db.session.flush()
+    return jsonify({
+        'message': 'Comment created successfully',
+        'comment': comment.to_dict()
+    }), 201
 
 
 @app.route('/api/comments/<int:comment_id>', methods=['GET'])
+@conditional('comment:{comment_id}')
+@cache.cached(timeout=60, key_prefix=versioned_key('comment:{comment_id}'), unless=versions_unavailable('comment:{comment_id}'), response_filter=cacheable)
 def get_comment(comment_id):
-    try:
-        comment = Comment.query.get_or_404(comment_id)
-        return jsonify({'comment': comment.to_dict()}), 200
-    except Exception as e:
-        return jsonify({'error': 'Comment not found', 'message': str(e)}), 404
+    version = resource_versions(('comment:{comment_id}',))
+    comment = cached_comment_dict(comment_id, version) if version else comment_dict(comment_id)
+    if comment is None:
+        abort(404)
+    return jsonify({'comment': comment}), 200
 
 
 @app.route('/api/comments/<int:comment_id>', methods=['PUT'])
 def update_comment(comment_id):
-    try:
-        comment = Comment.query.get_or_404(comment_id)
-        data = request.get_json()
-        if not data or not data.get('content'):
-            return jsonify({'error': 'Comment content is required'}), 400
-        if not data['content'].strip():
-            return jsonify({'error': 'Comment content cannot be empty'}), 400
-        comment.content = data['content'].strip()
-        comment.updated_at = datetime.utcnow()
-        db.session.commit()
-        return jsonify({
-            'message': 'Comment updated successfully',
-            'comment': comment.to_dict()
-        }), 200
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': 'Failed to update comment', 'message': str(e)}), 500
+    comment = Comment.query.get_or_404(comment_id)
+    data = msgspec.json.decode(request.get_data(), type=CommentIn)
+    if not data.content:
+        return jsonify({'error': 'Comment content is required'}), 400
+    if not data.content.strip():
+        return jsonify({'error': 'Comment content cannot be empty'}), 400
+    comment.content = data.content.strip()
+    db.session.flush()
+    return jsonify({
+        'message': 'Comment updated successfully',
+        'comment': comment.to_dict()
+    }), 200
 
 
 @app.route('/api/comments/<int:comment_id>', methods=['DELETE'])
 def delete_comment(comment_id):
+    comment = Comment.query.get_or_404(comment_id)
+    db.session.delete(comment)
+    db.session.flush()
+    return jsonify({'message': 'Comment deleted successfully'}), 200
+
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
     try:
-        comment = Comment.query.get_or_404(comment_id)
-        db.session.delete(comment)
-        db.session.commit()
-        return jsonify({'message': 'Comment deleted successfully'}), 200
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': 'Failed to delete comment', 'message': str(e)}), 500
+        job = Job.fetch(job_id, connection=redis_client)
+    except NoSuchJobError:
+        abort(404)
+    # Other jobs on the shared queue are not ours to show.
+    resource = job.meta.get('resource')
+    if resource is None:
+        abort(404)
+    status = job.get_status()
+    return jsonify({
+        'job_id': job.id,
+        'status': status,
+        resource: job.return_value() if status == 'finished' else job.args[0]
+    }), 200
 
 
 
 @app.route('/')
+@cache.cached(timeout=60)
 def index():
     return jsonify({
         'message': 'Better Software Assessment API',
@@ -259,7 +622,8 @@ def index():
         'endpoints': {
             'tasks': '/api/tasks',
             'task_comments': '/api/tasks/<task_id>/comments',
-            'comments': '/api/comments/<comment_id>'
+            'comments': '/api/comments/<comment_id>',
+            'jobs': '/api/jobs/<job_id>'
         }
     })
 
@@ -278,52 +642,71 @@ def internal_error(error):
     db.session.rollback()
     return jsonify({'error': 'Internal server error'}), 500
 
+@app.errorhandler(msgspec.DecodeError)
+def invalid_body(error):
+    return jsonify({'error': 'Invalid request body', 'message': str(error)}), 400
 
-
-def init_db():
-    with app.app_context():
-        db.create_all()
-        if Task.query.count() == 0:
-            task1 = Task(
-                title='Build Comment API',
-                description='Implement CRUD operations for task comments',
-                status='in_progress',
-                priority='high'
-            )
-            task2 = Task(
-                title='Create React Frontend',
-                description='Build React components for task and comment management',
-                status='pending',
-                priority='medium'
-            )
-            task3 = Task(
-                title='Write Tests',
-                description='Create comprehensive test suite for the application',
-                status='completed',
-                priority='high'
-            )
-            db.session.add_all([task1, task2, task3])
-            db.session.commit()
-            comment1 = Comment(
-                content='Started working on the comment model and basic CRUD operations.',
-                task_id=task1.id
-            )
-            comment2 = Comment(
-                content='API endpoints are working well. Need to add proper validation.',
-                task_id=task1.id
-            )
-            comment3 = Comment(
-                content='Planning the React component structure.',
-                task_id=task2.id
-            )
-            db.session.add_all([comment1, comment2, comment3])
-            db.session.commit()
-            print("Sample data created successfully!")
+@app.errorhandler(SQLAlchemyError)
+def database_error(error):
+    db.session.rollback()
+    return jsonify({'error': 'Database error', 'message': str(error)}), 500
+
+@app.errorhandler(HTTPException)
+def http_error(error):
+    return jsonify({'error': error.description}), error.code
+
+
+
+@app.cli.command('seed')
+def seed_db():
+    current = MigrationContext.configure(db.session.connection()).get_current_revision()
+    if current != ScriptDirectory.from_config(migrate.get_config()).get_current_head():
+        raise click.ClickException('Database is not migrated to the latest revision, run "flask db upgrade" first')
+    if Task.query.count() == 0:
+        task1, task2, task3 = db.session.scalars(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True),
+            [
+                {
+                    'title': 'Build Comment API',
+                    'description': 'Implement CRUD operations for task comments',
+                    'status': 'in_progress',
+                    'priority': 'high'
+                },
+                {
+                    'title': 'Create React Frontend',
+                    'description': 'Build React components for task and comment management',
+                    'status': 'pending',
+                    'priority': 'medium'
+                },
+                {
+                    'title': 'Write Tests',
+                    'description': 'Create comprehensive test suite for the application',
+                    'status': 'completed',
+                    'priority': 'high'
+                }
+            ]
+        ).all()
+        db.session.execute(insert(Comment), [
+            {
+                'content': 'Started working on the comment model and basic CRUD operations.',
+                'task_id': task1
+            },
+            {
+                'content': 'API endpoints are working well. Need to add proper validation.',
+                'task_id': task1
+            },
+            {
+                'content': 'Planning the React component structure.',
+                'task_id': task2
+            }
+        ])
+        db.session.commit()
+        cache.clear()
+        click.echo('Sample data created successfully!')
 
 
 
 if __name__ == '__main__':
-    init_db()
     print("Starting Better Software Assessment API...")
     print("Backend running on: http://localhost:5000")
     print("API Documentation available at: http://localhost:5000")
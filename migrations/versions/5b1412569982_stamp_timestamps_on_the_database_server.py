@@ -0,0 +1,41 @@
+"""stamp timestamps on the database server
+
+Revision ID: 5b1412569982
+Revises: c41a6832e3d1
+Create Date: 2026-10-15 18:12:01.307715
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1412569982'
+down_revision = 'c41a6832e3d1'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    'tasks': ('ix_tasks_created_at', [sa.literal_column('created_at DESC')]),
+    'comments': ('ix_comments_task_created', ['task_id', sa.literal_column('created_at DESC')])
+}
+
+
+def _alter_timestamps(server_default):
+    # SQLite rebuilds the table here and reflection loses the DESC ordering,
+    # so the listing indexes are recreated explicitly.
+    for table, (index, columns) in INDEXES.items():
+        op.drop_index(index, table_name=table)
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), server_default=server_default)
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), server_default=server_default)
+        op.create_index(index, table, columns, unique=False)
+
+
+def upgrade():
+    _alter_timestamps(sa.func.now())
+
+
+def downgrade():
+    _alter_timestamps(None)
@@ -0,0 +1,42 @@
+"""order comment listing index by id and stamp times in utc
+
+Revision ID: 9876476116f3
+Revises: cdd346f4d864
+Create Date: 2026-10-15 18:26:46.010193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9876476116f3'
+down_revision = 'cdd346f4d864'
+branch_labels = None
+depends_on = None
+
+
+def _alter_timestamps(server_default):
+    # CURRENT_TIMESTAMP is already UTC on SQLite; PostgreSQL stamps naive
+    # columns in the server's local zone unless told otherwise.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in ('tasks', 'comments'):
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), server_default=server_default)
+        op.alter_column(table, 'updated_at', existing_type=sa.DateTime(), server_default=server_default)
+
+
+def upgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_task_created')
+        batch_op.create_index('ix_comments_task_created', ['task_id', sa.literal_column('created_at DESC'), sa.literal_column('id DESC')], unique=False)
+
+    _alter_timestamps(sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)"))
+
+
+def downgrade():
+    _alter_timestamps(sa.func.now())
+
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_index('ix_comments_task_created')
+        batch_op.create_index('ix_comments_task_created', ['task_id', sa.literal_column('created_at DESC')], unique=False)
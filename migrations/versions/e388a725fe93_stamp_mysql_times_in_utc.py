@@ -0,0 +1,33 @@
+"""stamp mysql times in utc
+
+Revision ID: e388a725fe93
+Revises: 9876476116f3
+Create Date: 2026-10-15 18:35:56.168836
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e388a725fe93'
+down_revision = '9876476116f3'
+branch_labels = None
+depends_on = None
+
+
+def _alter_timestamps(server_default):
+    # CURRENT_TIMESTAMP on MySQL follows the session time zone, not UTC.
+    if op.get_bind().dialect.name not in ('mysql', 'mariadb'):
+        return
+    for table in ('tasks', 'comments'):
+        op.alter_column(table, 'created_at', existing_type=sa.DateTime(), server_default=server_default)
+        op.alter_column(table, 'updated_at', existing_type=sa.DateTime(), server_default=server_default)
+
+
+def upgrade():
+    _alter_timestamps(sa.text('(UTC_TIMESTAMP())'))
+
+
+def downgrade():
+    _alter_timestamps(sa.func.now())
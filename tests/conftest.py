@@ -0,0 +1,26 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test.db')
+os.environ['CACHE_TYPE'] = 'SimpleCache'
+
+import pytest
+from flask_migrate import upgrade
+
+from backend import app, cache
+
+
+@pytest.fixture(scope='session', autouse=True)
+def schema():
+    with app.app_context():
+        upgrade()
+
+
+@pytest.fixture
+def client():
+    app.testing = True
+    with app.app_context():
+        cache.clear()
+    return app.test_client()
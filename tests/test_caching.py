@@ -0,0 +1,165 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend import Task, app, cache, db
+
+
+class UnreachableCache:
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            raise RedisConnectionError('Connection refused')
+        return fail
+
+
+@pytest.fixture
+def redis_down(monkeypatch):
+    monkeypatch.setitem(app.extensions['cache'], cache, UnreachableCache())
+
+
+def version(name):
+    with app.app_context():
+        return cache.get(f'version:{name}')
+
+
+def create_task(client, title='Task'):
+    return client.post('/api/tasks', json={'title': title}).get_json()['task']
+
+
+def tasks_total(client):
+    return client.get('/api/tasks').get_json()['total']
+
+
+def test_commit_bumps_versions(client):
+    task = create_task(client)
+    client.get('/api/tasks')
+    client.get(f'/api/tasks/{task["id"]}')
+    before = version('tasks'), version(f'task:{task["id"]}')
+
+    client.put(f'/api/tasks/{task["id"]}', json={'status': 'completed'})
+
+    after = version('tasks'), version(f'task:{task["id"]}')
+    assert after[0] > before[0]
+    assert after[1] > before[1]
+
+
+def test_rollback_bumps_nothing(client):
+    total = tasks_total(client)
+    before = version('tasks')
+
+    with app.app_context():
+        db.session.add(Task(title='Discarded'))
+        db.session.flush()
+        db.session.rollback()
+        assert 'stale_versions' not in db.session.info
+        assert 'count_deltas' not in db.session.info
+
+    assert version('tasks') == before
+    assert tasks_total(client) == total
+
+
+def test_stale_etag_gets_fresh_task_after_write(client):
+    task = create_task(client)
+    url = f'/api/tasks/{task["id"]}'
+    etag = client.get(url).headers['ETag']
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    client.put(url, json={'title': 'Renamed'})
+
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['task']['title'] == 'Renamed'
+
+
+def test_stale_etag_gets_fresh_list_after_write(client):
+    task = create_task(client)
+    etag = client.get('/api/tasks').headers['ETag']
+    assert client.get('/api/tasks', headers={'If-None-Match': etag}).status_code == 304
+
+    client.post(f'/api/tasks/{task["id"]}/comments', json={'content': 'First'})
+
+    response = client.get('/api/tasks', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    listed = {row['id']: row for row in response.get_json()['tasks']}
+    assert listed[task['id']]['comments_count'] == 1
+
+
+def test_total_tracks_create_and_delete(client):
+    total = tasks_total(client)
+
+    task = create_task(client)
+    assert tasks_total(client) == total + 1
+
+    client.delete(f'/api/tasks/{task["id"]}')
+    assert tasks_total(client) == total
+
+
+def test_comments_total_tracks_create_and_delete(client):
+    task = create_task(client)
+    url = f'/api/tasks/{task["id"]}/comments'
+    assert client.get(url).get_json()['total'] == 0
+
+    comment = client.post(url, json={'content': 'First'}).get_json()['comment']
+    assert client.get(url).get_json()['total'] == 1
+
+    client.delete(f'/api/comments/{comment["id"]}')
+    assert client.get(url).get_json()['total'] == 0
+
+
+def test_expired_total_is_recounted(client):
+    total = tasks_total(client)
+    with app.app_context():
+        cache.delete('count:tasks')
+
+    create_task(client)
+
+    with app.app_context():
+        assert cache.get('count:tasks') is None
+    assert tasks_total(client) == total + 1
+
+
+def test_redis_outage_serves_uncached(client, redis_down):
+    with app.app_context():
+        before = db.session.query(Task).count()
+
+    response = client.post('/api/tasks', json={'title': 'Offline'})
+    assert response.status_code == 201
+    task = response.get_json()['task']
+    with app.app_context():
+        assert db.session.query(Task).count() == before + 1
+
+    url = f'/api/tasks/{task["id"]}'
+    assert client.get(url).get_json()['task']['title'] == 'Offline'
+    assert client.put(url, json={'title': 'Renamed'}).status_code == 200
+    assert client.get(url).get_json()['task']['title'] == 'Renamed'
+    assert client.get('/api/tasks').get_json()['total'] == before + 1
+
+
+def test_failed_commit_returns_json_error(client, monkeypatch):
+    total = tasks_total(client)
+
+    def fail():
+        raise SQLAlchemyError('disk I/O error')
+    monkeypatch.setattr(db.session, 'commit', fail)
+
+    response = client.post('/api/tasks', json={'title': 'Lost'})
+    assert response.status_code == 500
+    assert response.get_json()['error'] == 'Failed to save changes'
+
+    monkeypatch.undo()
+    assert tasks_total(client) == total
+
+
+def test_versions_outlive_the_default_timeout(client, monkeypatch):
+    added = {}
+    add = cache.add
+
+    def record_add(key, value, timeout=None):
+        added[key] = timeout
+        return add(key, value, timeout=timeout)
+    monkeypatch.setattr(cache, 'add', record_add)
+
+    client.get('/api/tasks')
+
+    with app.app_context():
+        assert added['version:tasks'] > cache.cache.default_timeout
@@ -0,0 +1,25 @@
+import pytest
+
+import backend
+
+
+class FakeJob:
+    id = 'job-1'
+    args = ({'title': 'Queued'},)
+
+    def __init__(self, meta):
+        self.meta = meta
+
+    def get_status(self):
+        return 'queued'
+
+
+@pytest.mark.parametrize('meta, status', [({'resource': 'task'}, 200), ({}, 404)])
+def test_only_create_jobs_are_visible(client, monkeypatch, meta, status):
+    monkeypatch.setattr(backend.Job, 'fetch', lambda job_id, connection: FakeJob(meta))
+
+    response = client.get('/api/jobs/job-1')
+
+    assert response.status_code == status
+    if status == 200:
+        assert response.get_json()['task'] == {'title': 'Queued'}
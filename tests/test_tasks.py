@@ -0,0 +1,24 @@
+from backend import app, db
+
+
+def test_update_without_returning_reads_the_row_back(client, monkeypatch):
+    with app.app_context():
+        monkeypatch.setattr(db.engine.dialect, 'update_returning', False)
+    task = client.post('/api/tasks', json={'title': 'Draft'}).get_json()['task']
+    client.post(f'/api/tasks/{task["id"]}/comments', json={'content': 'First'})
+
+    response = client.put(f'/api/tasks/{task["id"]}', json={'title': 'Final'})
+
+    assert response.status_code == 200
+    updated = response.get_json()['task']
+    assert updated['title'] == 'Final'
+    assert updated['comments_count'] == 1
+    assert client.put('/api/tasks/999999', json={'title': 'Missing'}).status_code == 404
+
+
+def test_fields_tolerate_whitespace(client):
+    client.post('/api/tasks', json={'title': 'Sparse'})
+
+    task = client.get('/api/tasks?fields=title, status').get_json()['tasks'][0]
+
+    assert set(task) == {'id', 'title', 'status', 'comments_count'}
@@ -0,0 +1,20 @@
+from gevent import monkey
+monkey.patch_all()
+
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+if os.getenv('DATABASE_URL', '').startswith('postgresql'):
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError as e:
+        raise RuntimeError(
+            'PostgreSQL under gevent needs psycopg2 and psycogreen: pip install psycopg2 psycogreen'
+        ) from e
+    patch_psycopg()
+
+from backend import app
+
+__all__ = ['app']